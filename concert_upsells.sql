@@ -38,6 +38,10 @@
       event_name values. This is treated as-is (both rows are included).
     - The event_id column is the shared key between events.csv and
       ticket_sales.csv, enabling sales analysis per event if needed.
+    - This file is read-only: it creates no indexes, tables, or statistics
+      and sets no session options, so it can be run against a shared
+      database. The case-insensitive match uses LOWER() so it does not
+      depend on any dialect's LIKE case rules.
 
 ================================================================================
 */
@@ -47,47 +51,40 @@
 -- MAIN QUERY: Associate each concert with its upsell events
 -- =============================================================================
 
-WITH concerts AS (
-    -- Identify primary concert events by the tour name in event_name.
-    -- This is the most reliable discriminator: no upsell event contains
+WITH ev AS (
+    -- Classify every event in a single pass over the table.
+    -- Concerts are identified by the tour name in event_name. This is the
+    -- most reliable discriminator: no upsell event contains
     -- "Super Awesome Tour", and every actual concert does.
-    SELECT
-        event_id   AS concert_event_id,
-        event_name AS concert_event_name,
-        venue_id,
-        event_dt
-    FROM events
-    WHERE LOWER(event_name) LIKE '%super awesome tour%'
-),
-upsells AS (
-    -- Everything not identified as a concert is an upsell.
-    -- This includes parking, VIP, lounge, coat check, fast lane,
-    -- premium seating, blankets, lockers, pre-show passes,
+    -- Everything else is an upsell: parking, VIP, lounge, coat check,
+    -- fast lane, premium seating, blankets, lockers, pre-show passes,
     -- "Upgrades & Extras" bundles, commemorative tickets, etc.
     SELECT
-        event_id   AS upsell_event_id,
-        event_name AS upsell_event_name,
+        event_id,
+        event_name,
         venue_id,
-        event_dt
+        event_dt,
+        LOWER(event_name) LIKE '%super awesome tour%' AS is_concert
     FROM events
-    WHERE LOWER(event_name) NOT LIKE '%super awesome tour%'
 )
 
 SELECT
-    c.concert_event_id,
-    c.concert_event_name,
+    c.event_id   AS concert_event_id,
+    c.event_name AS concert_event_name,
     c.venue_id,
     c.event_dt,
-    u.upsell_event_id,
-    u.upsell_event_name
-FROM concerts c
-LEFT JOIN upsells u
+    u.event_id   AS upsell_event_id,
+    u.event_name AS upsell_event_name
+FROM ev c
+LEFT JOIN ev u
     ON  c.venue_id = u.venue_id
     AND c.event_dt = u.event_dt
+    AND NOT u.is_concert
+WHERE c.is_concert
 ORDER BY
     c.event_dt,
     c.venue_id,
-    u.upsell_event_name;
+    upsell_event_name;
 
 
 /*
@@ -100,26 +97,27 @@ ORDER BY
   sub-venues, data entry mismatches, or missing concert records.
 */
 
-SELECT
-    u.upsell_event_id,
-    u.upsell_event_name,
-    u.venue_id,
-    u.event_dt
-FROM (
+WITH ev AS (
+    -- Same single-pass classification as the main query.
     SELECT
-        event_id   AS upsell_event_id,
-        event_name AS upsell_event_name,
+        event_id,
+        event_name,
         venue_id,
-        event_dt
+        event_dt,
+        LOWER(event_name) LIKE '%super awesome tour%' AS is_concert
     FROM events
-    WHERE LOWER(event_name) NOT LIKE '%super awesome tour%'
-) u
-LEFT JOIN (
-    SELECT DISTINCT venue_id, event_dt
-    FROM events
-    WHERE LOWER(event_name) LIKE '%super awesome tour%'
-) c
+)
+
+SELECT
+    u.event_id   AS upsell_event_id,
+    u.event_name AS upsell_event_name,
+    u.venue_id,
+    u.event_dt
+FROM ev u
+LEFT JOIN ev c
     ON  u.venue_id = c.venue_id
     AND u.event_dt = c.event_dt
-WHERE c.venue_id IS NULL
+    AND c.is_concert
+WHERE NOT u.is_concert
+  AND c.venue_id IS NULL
 ORDER BY u.event_dt, u.venue_id;